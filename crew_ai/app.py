@@ -14,7 +14,9 @@ st.set_page_config(page_title="Project Administrator Assistant", page_icon="🏢
 st.title("Assistant")
 
 # --- Data Loading (Cached for efficiency) ---
-@st.cache_data
+# cache_resource hands every rerun the same (read-only) object, so the agent's
+# per-dataset task index is built once instead of on every query.
+@st.cache_resource
 def load_hidden_json():
     """Loads the hidden JSON data from knowledge/data.json."""
     try:
@@ -142,6 +142,30 @@ list_all_agent = Agent(
 )
 
 
+# --- Task index ---
+
+# Enriched task list and the dataset object it was built from; rebuilt only when a different
+# object is passed. app.py loads the data with st.cache_resource, so reruns reuse one object.
+_all_tasks_source = None
+_all_tasks = []
+
+def _get_all_tasks(context_json: dict) -> list:
+    """Return every task with its parent site's id and name, built once per dataset."""
+    global _all_tasks_source, _all_tasks
+
+    if _all_tasks_source is not context_json:
+        _all_tasks = [
+            dict(task,
+                 parent_site_id=site.get('site_id'),
+                 parent_site_name=site.get('location_name'))
+            for site in context_json["data"]
+            if isinstance(site.get("request_tasks"), list)
+            for task in site["request_tasks"]
+        ]
+        _all_tasks_source = context_json
+    return _all_tasks
+
+
 # --- Main function to run the multimodal query ---
 
 def run_sites_tasks_agent_query(user_query: str, context_json: dict, chat_history: list = None) -> str:
@@ -261,16 +285,7 @@ def run_sites_tasks_agent_query(user_query: str, context_json: dict, chat_histor
         print(f"[TASK mode] Query: {query}")
 
         if context_json and "data" in context_json and isinstance(context_json["data"], list):
-            all_tasks = []
-            for site in context_json["data"]:
-                if "request_tasks" in site and isinstance(site["request_tasks"], list):
-                    for task in site["request_tasks"]:
-                        task_with_site_context = task.copy()
-                        task_with_site_context['parent_site_id'] = site.get('site_id')
-                        task_with_site_context['parent_site_name'] = site.get('location_name')
-                        all_tasks.append(task_with_site_context)
-            
-            filtered_data = search_json_objects(all_tasks, query)
+            filtered_data = search_json_objects(_get_all_tasks(context_json), query)
             if not filtered_data:
                 print(f"No relevant task data found for query: '{query}'. Passing empty list to helper.")
                 filtered_data = []
@@ -0,0 +1,63 @@
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+
+logger = logging.getLogger(__name__)
+
+# Most recent model responses kept in memory, keyed by a hash of the full request
+MAX_CACHED_RESPONSES = 256
+
+# Session-state key carrying the request hash from the before- to the after-model callback.
+# The "temp:" prefix keeps it out of persisted session state.
+_CACHE_KEY_STATE = "temp:llm_response_cache_key"
+
+_responses: "OrderedDict[str, LlmResponse]" = OrderedDict()
+
+
+def request_cache_key(llm_request: LlmRequest) -> str:
+    """
+    Hash the model, system instruction and conversation contents of a request.
+    """
+    digest = hashlib.sha256()
+    digest.update((llm_request.model or "").encode("utf-8"))
+    system_instruction = llm_request.config.system_instruction if llm_request.config else None
+    digest.update(str(system_instruction or "").encode("utf-8"))
+    for content in llm_request.contents:
+        digest.update(content.model_dump_json(exclude_none=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def use_cached_response(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """
+    before_model_callback: answer a repeated request from the cache instead of calling the model.
+    """
+    key = request_cache_key(llm_request)
+    cached = _responses.get(key)
+    if cached is not None:
+        _responses.move_to_end(key)
+        logger.info("Serving model response from cache.")
+        return cached.model_copy(deep=True)
+
+    callback_context.state[_CACHE_KEY_STATE] = key
+    return None
+
+
+def store_response(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> Optional[LlmResponse]:
+    """
+    after_model_callback: remember complete, successful responses for the request that produced them.
+    """
+    key = callback_context.state.get(_CACHE_KEY_STATE)
+    if key and llm_response.content and not llm_response.partial and not llm_response.error_code:
+        _responses[key] = llm_response.model_copy(deep=True)
+        _responses.move_to_end(key)
+        if len(_responses) > MAX_CACHED_RESPONSES:
+            _responses.popitem(last=False)
+    return None
@@ -1,6 +1,8 @@
+import inspect
 import logging
 from google.adk.agents import LlmAgent
 from ..tools.sites_tasks_tool import SiteTasksToolset
+from .response_cache import store_response, use_cached_response
 
 # Configure logging
 logging.basicConfig(
@@ -10,7 +12,8 @@ logger = logging.getLogger(__name__)
 
 logger.info("Creating sites_tasks_agent.")
 
-orchestrator_instructions = (
+# Static text with no per-call values, dedented once, so every request opens with the same cacheable prefix
+orchestrator_instructions = inspect.cleandoc(
         """You are an advanced AI Project Assistant. Your primary role is to understand user queries about sites and tasks, 
         and use the provided tools (plugins) to retrieve or synthesize the requested information. 
         You are the sole decision-maker for which tool to use, if any, and how to format the final response.
@@ -53,6 +56,9 @@ root_agent = LlmAgent(
     model="gemini-2.0-flash",
     instruction=orchestrator_instructions,
     tools=[sites_tasks_toolset_instance],
+    # Identical requests (same instruction, history and tool results) skip the model round-trip
+    before_model_callback=use_cached_response,
+    after_model_callback=store_response,
 )
 
 logger.info("sites_tasks_agent created.")
\ No newline at end of file
@@ -1,12 +1,14 @@
-import json
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+import os
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 from google.adk.agents.readonly_context import ReadonlyContext
 from google.adk.tools import FunctionTool
 from google.adk.tools.base_toolset import BaseTool, BaseToolset
 
-from ..utils import search_json_objects
+from ..utils import dumps_compact, load_json_file, search_json_objects
 
 # Configure logging
 logging.basicConfig(
@@ -14,39 +16,112 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def call_api() -> Dict[str, Any]:
-    """Loads data from the knowledge/data.json file."""
+DATA_PATH = "google_adk/knowledge/data.json"
+
+
+class _Snapshot(NamedTuple):
+    """One version of data.json and everything derived from it, swapped in as a unit."""
+    mtime: float
+    data: Dict[str, Any]
+    json: str
+    all_tasks: List[Dict[str, Any]]
+    # Lowercased site_id / location_name -> site, and task_sys_id / classification -> task
+    sites_by_key: Dict[str, Dict[str, Any]]
+    tasks_by_key: Dict[str, Dict[str, Any]]
+
+
+def _tasks_with_site_context(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    all_tasks = []
+    for site in data.get("data", []):
+        if "request_tasks" in site and isinstance(site["request_tasks"], list):
+            for task in site["request_tasks"]:
+                task_with_site_context = task.copy()
+                task_with_site_context["parent_site_id"] = site.get("site_id")
+                task_with_site_context["parent_site_name"] = site.get("location_name")
+                all_tasks.append(task_with_site_context)
+    return all_tasks
+
+
+def _index_by_lowercase(records: List[Dict[str, Any]], fields: Tuple[str, ...]) -> Dict[str, Dict[str, Any]]:
+    # The first record (in file order) matching on any of the fields wins, as in a linear scan
+    index: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        for field in fields:
+            value = record.get(field)
+            if isinstance(value, str):
+                index.setdefault(value.lower(), record)
+    return index
+
+
+# Reused until the file's mtime changes; tools read it from worker threads, so reloads take the lock
+_snapshot: Optional[_Snapshot] = None
+_snapshot_lock = threading.Lock()
+# Served while data.json is missing
+_EMPTY_SNAPSHOT = _Snapshot(0.0, {}, dumps_compact({}), [], {}, {})
+
+
+def _load_snapshot() -> _Snapshot:
+    global _snapshot
     try:
-        with open("google_adk/knowledge/data.json", "r") as f:
-            return json.load(f)
+        mtime = os.stat(DATA_PATH).st_mtime
+        snapshot = _snapshot
+        if snapshot is None or snapshot.mtime != mtime:
+            with _snapshot_lock:
+                snapshot = _snapshot
+                if snapshot is None or snapshot.mtime != mtime:
+                    data = load_json_file(DATA_PATH)
+                    all_tasks = _tasks_with_site_context(data)
+                    snapshot = _Snapshot(
+                        mtime,
+                        data,
+                        dumps_compact(data),
+                        all_tasks,
+                        _index_by_lowercase(data.get("data", []), ("site_id", "location_name")),
+                        _index_by_lowercase(all_tasks, ("task_sys_id", "classification")),
+                    )
+                    _snapshot = snapshot
+        return snapshot
     except FileNotFoundError:
         logger.error("knowledge/data.json not found.")
-        return {}
+        return _EMPTY_SNAPSHOT
+
+
+def call_api() -> Dict[str, Any]:
+    """Loads data from the knowledge/data.json file, re-parsing only when it changes."""
+    return _load_snapshot().data
+
+
+def call_api_json() -> str:
+    """Returns the loaded data serialized as JSON, dumped once per file version."""
+    return _load_snapshot().json
+
+
+async def call_api_async() -> Dict[str, Any]:
+    """Loads the data in a worker thread so the file read does not block the event loop."""
+    return await asyncio.to_thread(call_api)
+
+
+async def _load_snapshot_async() -> _Snapshot:
+    return await asyncio.to_thread(_load_snapshot)
 
 # Tool Functions
-def get_site_details(site_query: str) -> str:
-    all_data = call_api()
-    logger.info(f"Getting site details for query: '{site_query}'")
-    sites = all_data.get("data", [])
+async def get_site_details(site_query: str) -> str:
+    snapshot = await _load_snapshot_async()
+    logger.info("Getting site details for query: '%s'", site_query)
+    sites = snapshot.data.get("data", [])
     filtered_sites = search_json_objects(sites, site_query)
 
     if not filtered_sites:
-        logger.warning(f"No site found matching '{site_query}'.")
+        logger.warning("No site found matching '%s'.", site_query)
         return f"No site found matching '{site_query}'. Please clarify the site ID or name."
 
-    site_found = None
-    for site in filtered_sites:
-        if (
-            site.get("site_id", "").lower() == site_query.lower()
-            or site.get("location_name", "").lower() == site_query.lower()
-        ):
-            site_found = site
-            break
+    # Exact site_id / location_name match through the index built at load time
+    site_found = snapshot.sites_by_key.get(site_query.lower())
     if not site_found and filtered_sites:
         site_found = filtered_sites[0]
 
     if site_found:
-        logger.info(f"Found site: {site_found.get('location_name', 'N/A')}")
+        logger.info("Found site: %s", site_found.get('location_name', 'N/A'))
         return (
             f"- location_name: {site_found.get('location_name', 'N/A')}\n"
             f"- site_id: {site_found.get('site_id', 'N/A')}\n"
@@ -55,21 +130,21 @@ def get_site_details(site_query: str) -> str:
             f"- Company Size: {site_found.get('address_2', 'N/A')}"
         )
 
-    logger.warning(f"No relevant site found for '{site_query}'.")
+    logger.warning("No relevant site found for '%s'.", site_query)
     return f"No relevant site found for '{site_query}' within the provided data."
 
 
-def search_sites(query: str) -> str:
-    all_data = call_api()
-    logger.info(f"Searching sites with query: '{query}'")
+async def search_sites(query: str) -> str:
+    all_data = await call_api_async()
+    logger.info("Searching sites with query: '%s'", query)
     sites = all_data.get("data", [])
     filtered_sites = search_json_objects(sites, query)
 
     if not filtered_sites:
-        logger.warning(f"No sites found for query: '{query}'.")
+        logger.warning("No sites found for query: '%s'.", query)
         return f"No sites found matching the criteria: '{query}'."
 
-    logger.info(f"Found {len(filtered_sites)} sites for query: '{query}'.")
+    logger.info("Found %d sites for query: '%s'.", len(filtered_sites), query)
     output = "### Found Sites:\n\n"
     for site in filtered_sites:
         output += (
@@ -78,67 +153,45 @@ def search_sites(query: str) -> str:
     return output
 
 
-def get_task_details(task_query: str) -> str:
-    all_data = call_api()
-    logger.info(f"Getting task details for query: '{task_query}'")
-    all_tasks = []
-    for site in all_data.get("data", []):
-        if "request_tasks" in site and isinstance(site["request_tasks"], list):
-            for task in site["request_tasks"]:
-                task_with_site_context = task.copy()
-                task_with_site_context["parent_site_id"] = site.get("site_id")
-                task_with_site_context["parent_site_name"] = site.get("location_name")
-                all_tasks.append(task_with_site_context)
+async def get_task_details(task_query: str) -> str:
+    snapshot = await _load_snapshot_async()
+    all_tasks = snapshot.all_tasks
+    logger.info("Getting task details for query: '%s'", task_query)
 
     filtered_tasks = search_json_objects(all_tasks, task_query)
 
     if not filtered_tasks:
-        logger.warning(f"No task found for query: '{task_query}'.")
+        logger.warning("No task found for query: '%s'.", task_query)
         return f"No task found matching '{task_query}'. Please clarify the task ID or description."
 
-    task_found = None
-    for task in filtered_tasks:
-        if (
-            task.get("task_sys_id", "").lower() == task_query.lower()
-            or task.get("classification", "").lower() == task_query.lower()
-        ):
-            task_found = task
-            break
+    task_found = snapshot.tasks_by_key.get(task_query.lower())
     if not task_found and filtered_tasks:
         task_found = filtered_tasks[0]
 
     if task_found:
-        logger.info(f"Found task: {task_found.get('task_sys_id', 'N/A')}")
-        return json.dumps(task_found, indent=2)
+        logger.info("Found task: %s", task_found.get('task_sys_id', 'N/A'))
+        return dumps_compact(task_found)
 
-    logger.warning(f"No relevant task found for '{task_query}'.")
+    logger.warning("No relevant task found for '%s'.", task_query)
     return f"No relevant task found for '{task_query}'."
 
 
-def get_tasks_for_site(site_query: str) -> str:
-    all_data = call_api()
-    logger.info(f"Getting tasks for site: '{site_query}'")
-    sites = all_data.get("data", [])
+async def get_tasks_for_site(site_query: str) -> str:
+    snapshot = await _load_snapshot_async()
+    logger.info("Getting tasks for site: '%s'", site_query)
 
-    site_found = None
-    for site in sites:
-        if (
-            site.get("site_id", "").lower() == site_query.lower()
-            or site.get("location_name", "").lower() == site_query.lower()
-        ):
-            site_found = site
-            break
+    site_found = snapshot.sites_by_key.get(site_query.lower())
 
     if not site_found:
-        logger.warning(f"Site not found for query: '{site_query}'.")
+        logger.warning("Site not found for query: '%s'.", site_query)
         return f"No site found matching '{site_query}'. Cannot list tasks."
 
     tasks = site_found.get("request_tasks", [])
     if not tasks:
-        logger.warning(f"No tasks found for site: {site_found.get('location_name', 'N/A')}")
+        logger.warning("No tasks found for site: %s", site_found.get('location_name', 'N/A'))
         return f"No tasks found for site '{site_found.get('location_name', site_query)}' (ID: {site_found.get('site_id', 'N/A')})."
 
-    logger.info(f"Found {len(tasks)} tasks for site: {site_found.get('location_name', 'N/A')}")
+    logger.info("Found %d tasks for site: %s", len(tasks), site_found.get('location_name', 'N/A'))
     output = f"### Tasks for Site '{site_found.get('location_name', site_query)}' (ID: {site_found.get('site_id', 'N/A')}):\n\n"
     for task in tasks:
         output += (
@@ -147,10 +200,10 @@ def get_tasks_for_site(site_query: str) -> str:
     return output
 
 
-def get_all_data_json() -> str:
-    all_data = call_api()
+async def get_all_data_json() -> str:
+    all_data_json = await asyncio.to_thread(call_api_json)
     logger.info("Getting all data as JSON.")
-    return json.dumps(all_data, indent=2)
+    return all_data_json
 
 
 class SiteTasksToolset(BaseToolset):
@@ -1,5 +1,11 @@
 import json
 import re
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
 
 
 def load_stopwords_from_file(file_path: str) -> set:
@@ -16,6 +22,24 @@ def load_stopwords_from_file(file_path: str) -> set:
 
 all_stopwords = load_stopwords_from_file("knowledge/stopwords.txt")
 
+def load_json_file(file_path: str) -> Any:
+    """
+    Parse a JSON file, with orjson when installed.
+    """
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def dumps_compact(obj: Any) -> str:
+    """
+    Serialize to minified JSON for tool results; indentation only costs time and LLM tokens.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
 def search_json_objects(data, query):
     """
     Search JSON objects for any keyword from cleaned query.
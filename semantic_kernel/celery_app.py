@@ -0,0 +1,17 @@
+import os
+
+from celery import Celery
+
+from dotenv import load_dotenv;load_dotenv()
+
+
+# Kept apart from tasks.py so clients can enqueue by task name without importing the agents.
+# Redis serves both as the broker and the result backend unless configured otherwise
+broker_url = os.getenv("CELERY_BROKER_URL") or "redis://localhost:6379/0"
+app = Celery(
+    "agent_tasks",
+    broker=broker_url,
+    backend=os.getenv("CELERY_RESULT_BACKEND") or broker_url,
+)
+
+RUN_QUERY_TASK = "agent_tasks.run_query"
@@ -1,7 +1,13 @@
-import json
-from typing import Any, Dict
+import asyncio
+from collections import Counter
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
 
-from core.utils import search_json_objects
+from core.utils import (build_token_index, dumps_indented,
+                        flatten_json_object, normalize_query,
+                        search_json_indices, search_token_index)
+from semantic_kernel.agents import Agent
 from semantic_kernel.functions import kernel_function
 
 from dotenv import load_dotenv;load_dotenv()
@@ -11,120 +17,285 @@ class SiteTasksPlugin:
     """
     A plugin to interact with site and task data.
     The entire dataset is passed to its constructor.
+
+    Everything derived from the dataset is built in __init__ and frozen (tuples and
+    read-only mappings), since the per-instance lru_caches assume it never changes.
     """
+    __slots__ = (
+        "_all_data", "_site_haystacks", "_by_site_id", "_by_location",
+        "_site_md_lines", "_site_task_md", "_all_tasks", "_task_haystacks",
+        "_task_by_id", "_task_by_description", "_all_data_json", "_token_to_sites",
+        "_token_to_tasks", "_site_count_by_status_md", "_total_task_count_md",
+        "_all_sites_md", "_site_details_cache", "_search_sites_cache",
+        "_task_details_cache", "_tasks_for_site_cache",
+    )
+
     _all_data: Dict[str, Any]
+    _site_haystacks: Tuple[str, ...]
+    _by_site_id: Mapping[str, int]
+    _by_location: Mapping[str, int]
+    _site_md_lines: Tuple[str, ...]
+    _site_task_md: Tuple[str, ...]
+    _all_tasks: Tuple[Dict[str, Any], ...]
+    _task_haystacks: Tuple[str, ...]
+    _task_by_id: Mapping[str, Dict[str, Any]]
+    _task_by_description: Mapping[str, Dict[str, Any]]
+    _all_data_json: str
+    _token_to_sites: Mapping[str, Set[int]]
+    _token_to_tasks: Mapping[str, Set[int]]
+    _site_count_by_status_md: str
+    _total_task_count_md: str
+    _all_sites_md: str
 
     def __init__(self, all_data_param: Dict[str, Any]):
         self._all_data = all_data_param
+        sites = all_data_param.get("data", [])
+        self._all_data_json = dumps_indented(all_data_param)
+
+        # Search haystacks are built once per dataset rather than per query
+        self._site_haystacks = tuple(flatten_json_object(site) for site in sites)
+
+        # Exact-match lookups from lowercase ID/name to site position; the first
+        # occurrence wins, like the linear scans these replace.
+        by_site_id: Dict[str, int] = {}
+        by_location: Dict[str, int] = {}
+        # Every task enriched with its parent site, so lookups don't copy per call
+        all_tasks: List[Dict[str, Any]] = []
+        for position, site in enumerate(sites):
+            site_id = site.get("site_id")
+            location_name = site.get("location_name")
+            if site_id:
+                by_site_id.setdefault(normalize_query(site_id), position)
+            if location_name:
+                by_location.setdefault(normalize_query(location_name), position)
+
+            if isinstance(site.get("request_tasks"), list):
+                for task in site["request_tasks"]:
+                    all_tasks.append(
+                        dict(task, parent_site_id=site_id, parent_site_name=location_name)
+                    )
+        self._by_site_id = MappingProxyType(by_site_id)
+        self._by_location = MappingProxyType(by_location)
+        self._all_tasks = tuple(all_tasks)
+
+        self._task_haystacks = tuple(flatten_json_object(task) for task in self._all_tasks)
+        task_by_id: Dict[str, Dict[str, Any]] = {}
+        task_by_description: Dict[str, Dict[str, Any]] = {}
+        for task in self._all_tasks:
+            if task.get("task_id"):
+                task_by_id.setdefault(normalize_query(task["task_id"]), task)
+            if task.get("description"):
+                task_by_description.setdefault(normalize_query(task["description"]), task)
+        self._task_by_id = MappingProxyType(task_by_id)
+        self._task_by_description = MappingProxyType(task_by_description)
+
+        # Markdown fragments are rendered once; outputs only join the selected ones
+        self._site_md_lines = tuple(
+            f"- **{site.get('location_name', 'N/A')}** (ID: {site.get('site_id', 'N/A')}) - Status: {site.get('state', 'N/A')}\n"
+            for site in sites
+        )
+        self._site_task_md = tuple(
+            "".join(
+                f"- **Task ID:** {task.get('task_id', 'N/A')} - **Description:** {task.get('description', 'N/A')}\n"
+                for task in site.get("request_tasks") or []
+            )
+            for site in sites
+        )
+
+        # Aggregates for the overall/summary/list-all agents, so they never need the raw dataset
+        state_counts = Counter(site.get("state", "N/A") for site in sites)
+        self._site_count_by_status_md = (
+            f"### Sites by Status (total: {len(sites)}):\n\n"
+            + "".join(f"- {state}: {count}\n" for state, count in state_counts.most_common())
+        )
+        self._total_task_count_md = f"Total tasks: {len(self._all_tasks)} across {len(sites)} sites."
+        self._all_sites_md = f"### All Sites ({len(sites)}):\n\n" + "".join(self._site_md_lines)
+
+        # Inverted indexes answer whole-token queries with a few set intersections
+        self._token_to_sites = MappingProxyType(build_token_index(self._site_haystacks))
+        self._token_to_tasks = MappingProxyType(build_token_index(self._task_haystacks))
+
+        # The dataset is read-only, so tool results are memoized per normalized query.
+        # Lookups return None when nothing matched; the caller words that reply.
+        self._site_details_cache = lru_cache(maxsize=256)(self._lookup_site_details)
+        self._search_sites_cache = lru_cache(maxsize=256)(self._lookup_sites)
+        self._task_details_cache = lru_cache(maxsize=256)(self._lookup_task_details)
+        self._tasks_for_site_cache = lru_cache(maxsize=256)(self._lookup_tasks_for_site)
+
+    def _find_site(self, key: str) -> Optional[int]:
+        position = self._by_site_id.get(key)
+        if position is None:
+            position = self._by_location.get(key)
+        return position
+
+    def _search_site_positions(self, key: str) -> List[int]:
+        positions = search_token_index(self._token_to_sites, key)
+        if positions:
+            return positions
+        # Partial words (e.g. "bangal") only match through the substring scan
+        return search_json_indices(self._site_haystacks, key)
+
+    def _search_tasks(self, key: str) -> List[Dict[str, Any]]:
+        positions = search_token_index(self._token_to_tasks, key)
+        if not positions:
+            positions = search_json_indices(self._task_haystacks, key)
+        return [self._all_tasks[i] for i in positions]
+
+    def _lookup_site_details(self, key: str) -> Optional[str]:
+        position = self._find_site(key)
+        if position is None:
+            positions = self._search_site_positions(key)
+
+            if not positions:
+                return None
+            position = positions[0]
+
+        site_found = self._all_data["data"][position]
+        return (
+            f"- location_name: {site_found.get('location_name', 'N/A')}\n"
+            f"- site_id: {site_found.get('site_id', 'N/A')}\n"
+            f"- status: {site_found.get('state', 'N/A')}\n"
+            f"- Phase: {site_found.get('latitude', 'N/A')}\n"
+            f"- Company Size: {site_found.get('address_2', 'N/A')}"
+        )
+
+    def _lookup_sites(self, key: str) -> Optional[str]:
+        positions = self._search_site_positions(key)
+
+        if not positions:
+            return None
+
+        return "### Found Sites:\n\n" + "".join(self._site_md_lines[i] for i in positions)
+
+    def _lookup_task_details(self, key: str) -> Optional[str]:
+        task_found = self._task_by_id.get(key) or self._task_by_description.get(key)
+        if task_found is None:
+            filtered_tasks = self._search_tasks(key)
+
+            if not filtered_tasks:
+                return None
+            task_found = filtered_tasks[0]
+
+        return dumps_indented(task_found)
+
+    def _lookup_tasks_for_site(self, key: str) -> Optional[str]:
+        position = self._find_site(key)
+        if position is None:
+            return None
+
+        site_found = self._all_data["data"][position]
+        if not site_found.get("request_tasks"):
+            return f"No tasks found for site '{site_found.get('location_name', key)}' (ID: {site_found.get('site_id', 'N/A')})."
+
+        return (
+            f"### Tasks for Site '{site_found.get('location_name', key)}' (ID: {site_found.get('site_id', 'N/A')}):\n\n"
+            + self._site_task_md[position]
+        )
 
     @kernel_function(
         name="get_site_details",
         description="Given a site ID or name, retrieve detailed information for that single site. Returns site details in Markdown.",
     )
     def get_site_details(self, site_query: str) -> str:
-        sites = self._all_data.get("data", [])
-        filtered_sites = search_json_objects(sites, site_query)
-
-        if not filtered_sites:
+        result = self._site_details_cache(normalize_query(site_query))
+        if result is None:
             return f"No site found matching '{site_query}'. Please clarify the site ID or name."
-        
-        site_found = None
-        for site in filtered_sites:
-            if site.get("site_id", "").lower() == site_query.lower() or site.get("location_name", "").lower() == site_query.lower():
-                site_found = site
-                break
-        if not site_found and filtered_sites:
-            site_found = filtered_sites[0]
-
-        if site_found:
-            return (
-                f"- location_name: {site_found.get('location_name', 'N/A')}\n"
-                f"- site_id: {site_found.get('site_id', 'N/A')}\n"
-                f"- status: {site_found.get('state', 'N/A')}\n"
-                f"- Phase: {site_found.get('latitude', 'N/A')}\n"
-                f"- Company Size: {site_found.get('address_2', 'N/A')}"
-            )
-        return f"No relevant site found for '{site_query}' within the provided data."
+        return result
 
     @kernel_function(
         name="search_sites",
         description="Searches and lists multiple sites based on a search query, like 'sites in Bangalore' or 'active sites'. Returns a Markdown list of site names, IDs, and statuses.",
     )
     def search_sites(self, query: str) -> str:
-        sites = self._all_data.get("data", [])
-        filtered_sites = search_json_objects(sites, query)
-
-        if not filtered_sites:
+        result = self._search_sites_cache(normalize_query(query))
+        if result is None:
             return f"No sites found matching the criteria: '{query}'."
-
-        output = "### Found Sites:\n\n"
-        for site in filtered_sites:
-            output += (
-                f"- **{site.get('location_name', 'N/A')}** (ID: {site.get('site_id', 'N/A')}) - Status: {site.get('state', 'N/A')}\n"
-            )
-        return output
+        return result
 
     @kernel_function(
         name="get_task_details",
         description="Given a task ID or description, retrieve detailed information for that single task. Returns task details in Markdown.",
     )
     def get_task_details(self, task_query: str) -> str:
-        all_tasks = []
-        for site in self._all_data.get("data", []):
-            if "request_tasks" in site and isinstance(site["request_tasks"], list):
-                for task in site["request_tasks"]:
-                    task_with_site_context = task.copy()
-                    task_with_site_context['parent_site_id'] = site.get('site_id')
-                    task_with_site_context['parent_site_name'] = site.get('location_name')
-                    all_tasks.append(task_with_site_context)
-        
-        filtered_tasks = search_json_objects(all_tasks, task_query)
-
-        if not filtered_tasks:
+        result = self._task_details_cache(normalize_query(task_query))
+        if result is None:
             return f"No task found matching '{task_query}'. Please clarify the task ID or description."
-
-        task_found = None
-        for task in filtered_tasks:
-            if task.get("task_id", "").lower() == task_query.lower() or task.get("description", "").lower() == task_query.lower():
-                task_found = task
-                break
-        if not task_found and filtered_tasks:
-            task_found = filtered_tasks[0]
-
-        if task_found:
-            return json.dumps(task_found, indent=2)
-        return f"No relevant task found for '{task_query}'."
+        return result
 
     @kernel_function(
         name="get_tasks_for_site",
         description="Given a site ID or name, list all associated tasks for that site. Returns a Markdown list of task IDs and descriptions.",
     )
     def get_tasks_for_site(self, site_query: str) -> str:
-        sites = self._all_data.get("data", [])
-        
-        site_found = None
-        for site in sites:
-            if site.get("site_id", "").lower() == site_query.lower() or site.get("location_name", "").lower() == site_query.lower():
-                site_found = site
-                break
-
-        if not site_found:
+        result = self._tasks_for_site_cache(normalize_query(site_query))
+        if result is None:
             return f"No site found matching '{site_query}'. Cannot list tasks."
+        return result
+    
+    @kernel_function(
+        name="get_site_count_by_status",
+        description="Returns the total number of sites and the number of sites in each status (state). Use this for site counts and status breakdowns.",
+    )
+    def get_site_count_by_status(self) -> str:
+        return self._site_count_by_status_md
 
-        tasks = site_found.get("request_tasks", [])
-        if not tasks:
-            return f"No tasks found for site '{site_found.get('location_name', site_query)}' (ID: {site_found.get('site_id', 'N/A')})."
+    @kernel_function(
+        name="get_total_task_count",
+        description="Returns the total number of tasks across all sites.",
+    )
+    def get_total_task_count(self) -> str:
+        return self._total_task_count_md
+
+    @kernel_function(
+        name="list_all_sites_markdown",
+        description="Returns a Markdown list of every site with its name, ID and status. Use this to list all sites.",
+    )
+    def list_all_sites_markdown(self) -> str:
+        return self._all_sites_md
 
-        output = f"### Tasks for Site '{site_found.get('location_name', site_query)}' (ID: {site_found.get('site_id', 'N/A')}):\n\n"
-        for task in tasks:
-            output += (
-                f"- **Task ID:** {task.get('task_id', 'N/A')} - **Description:** {task.get('description', 'N/A')}\n"
-            )
-        return output
-    
     @kernel_function(
         name="get_all_data_json",
         description="Returns the entire loaded JSON dataset containing all sites and their associated tasks. Use this for aggregation, summarization, or listing all entries.",
     )
     def get_all_data_json(self) -> str:
-        return json.dumps(self._all_data, indent=2)
+        return self._all_data_json
+
+
+class ParallelQueryPlugin:
+    """
+    A plugin to answer the independent parts of a multi-part request with several agents at once.
+    The participating agents are passed to its constructor.
+    """
+    _agents: Dict[str, Agent]
+
+    def __init__(self, agents: List[Agent]):
+        self._agents = {agent.name: agent for agent in agents}
+
+    async def _invoke_agent(self, agent: Agent, part: str) -> str:
+        response = await agent.get_response(messages=part)
+        return str(response.content)
+
+    @kernel_function(
+        name="answer_multipart",
+        description="Answers several independent sub-questions concurrently. 'parts' holds one sub-question per entry and 'agent_names' the name of the helper agent that should answer the sub-question at the same position. Returns the answers in Markdown.",
+    )
+    async def answer_multipart(self, parts: List[str], agent_names: List[str]) -> str:
+        if len(parts) != len(agent_names):
+            return "Error: 'parts' and 'agent_names' must have the same number of entries."
+
+        unknown = [name for name in agent_names if name not in self._agents]
+        if unknown:
+            return f"Error: Unknown agent(s) {', '.join(unknown)}. Available agents: {', '.join(self._agents)}."
+
+        # LLM calls are I/O bound, so the parts are awaited together instead of one after another
+        results = await asyncio.gather(
+            *(self._invoke_agent(self._agents[name], part) for name, part in zip(agent_names, parts)),
+            return_exceptions=True,
+        )
+
+        output = []
+        for name, part, result in zip(agent_names, parts, results):
+            if isinstance(result, Exception):
+                result = f"Error from {name}: {result}"
+            output.append(f"### {part}\n\n{result}\n")
+        return "\n".join(output)
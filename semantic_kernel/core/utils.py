@@ -1,5 +1,17 @@
 import json
 import re
+import sys
+from typing import Any, Dict, List, Set
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to ijson or json
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; fall back to a full json.load
+    ijson = None
 
 
 def load_stopwords_from_file(file_path: str) -> set:
@@ -16,20 +28,129 @@ def load_stopwords_from_file(file_path: str) -> set:
 
 all_stopwords = load_stopwords_from_file("knowledge/stopwords.txt")
 
-def search_json_objects(data, query):
+def _as_dataset(document: Any) -> Dict[str, Any]:
+    # A root that is not an object holds no sites; every parser branch treats it as empty
+    return document if isinstance(document, dict) else {}
+
+def load_site_tasks_data(file_path: str) -> Dict[str, Any]:
     """
-    Search JSON objects for any keyword from cleaned query.
+    Load the site/task dataset from a JSON file.
+
+    orjson is used when installed as the fastest parser; otherwise, when ijson
+    is installed the top-level members are streamed one by one instead of
+    materializing the whole document text first.
 
     Args:
-        data (list[dict]): List of JSON objects.
+        file_path (str): Path to the JSON file.
+
+    Returns:
+        dict: The parsed document ({} if its root is not an object).
+    """
+    with open(file_path, 'rb') as f:
+        if orjson is not None:
+            return _as_dataset(orjson.loads(f.read()))
+        if ijson is None:
+            return _as_dataset(json.load(f))
+        try:
+            # kvitems yields nothing for a non-object root, which gives {} as above
+            return dict(ijson.kvitems(f, "", use_float=True))
+        except ijson.JSONError as e:
+            # Surface parse failures the same way json.load does
+            raise json.JSONDecodeError(str(e), file_path, 0) from e
+
+def dumps_indented(obj: Any) -> str:
+    """Serialize an object to JSON indented by two spaces, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query or lookup key for case-insensitive matching.
+
+    The result is interned so index keys and queries compare by identity first.
+    """
+    return sys.intern(query.strip().casefold())
+
+
+def _iter_leaves(obj):
+    """Yield every primitive value of a JSON object by recursive walk."""
+    if isinstance(obj, dict):
+        for value in obj.values():
+            yield from _iter_leaves(value)
+    elif isinstance(obj, list):
+        for value in obj:
+            yield from _iter_leaves(value)
+    elif obj is not None:
+        yield obj
+
+
+def flatten_json_object(obj) -> str:
+    """
+    Build the case-folded search haystack of a JSON object.
+
+    Only leaf values are kept, so keys and structural characters never match.
+    """
+    return " ".join(map(str, _iter_leaves(obj))).casefold()
+
+
+def extract_keywords(query: str) -> List[str]:
+    """Tokenize a query and drop stopwords."""
+    tokens = re.findall(r'\w+', query.casefold())
+    return [sys.intern(t) for t in tokens if t not in all_stopwords]
+
+
+def build_token_index(haystacks: List[str]) -> Dict[str, Set[int]]:
+    """
+    Build an inverted index mapping each token to the positions of the haystacks containing it.
+
+    Args:
+        haystacks (list[str]): flatten_json_object() output per object.
+
+    Returns:
+        dict[str, set[int]]: Token to object positions.
+    """
+    index: Dict[str, Set[int]] = {}
+    for position, haystack in enumerate(haystacks):
+        for token in set(re.findall(r'\w+', haystack)):
+            index.setdefault(sys.intern(token), set()).add(position)
+    return index
+
+
+def search_token_index(index: Dict[str, Set[int]], query: str) -> List[int]:
+    """
+    Return the positions of the objects containing every keyword of the query as a whole token.
+
+    Args:
+        index (dict[str, set[int]]): Output of build_token_index().
         query (str): User query string.
 
     Returns:
-        list[dict]: List of matched JSON objects.
+        list[int]: Matching positions in ascending order.
+    """
+    keywords = extract_keywords(query)
+    if not keywords:
+        return []
+
+    postings = [index.get(k) for k in keywords]
+    if not all(postings):
+        return []
+    return sorted(set.intersection(*postings))
+
+
+def search_json_indices(haystacks: List[str], query: str) -> List[int]:
+    """
+    Return the positions of the haystacks containing any keyword from the cleaned query.
+
+    Args:
+        haystacks (list[str]): flatten_json_object() output per object.
+        query (str): User query string.
+
+    Returns:
+        list[int]: Matching positions in ascending order.
     """
     # Clean query tokens
-    tokens = re.findall(r'\w+', query.lower())
-    keywords = [t for t  in tokens if t not in all_stopwords]
+    keywords = extract_keywords(query)
 
     if not keywords:
         # If no keywords, it means the query might have been entirely stopwords,
@@ -38,12 +159,24 @@ def search_json_objects(data, query):
         # The routing logic in run_multimodal_query should handle "list all" via LISTALL label.
         return [] # Return empty list if no meaningful keywords for specific filtering
 
-    matched = []
-    for obj in data:
-        dumped = json.dumps(obj).lower()
-        
-        # If any keyword is substring in dumped JSON, keep object
-        if any(k in dumped for k in keywords):
-            matched.append(obj)
+    # If any keyword is substring of the object's leaf values, keep object
+    return [i for i, haystack in enumerate(haystacks) if any(k in haystack for k in keywords)]
+
+
+def search_json_objects(data, query, haystacks=None):
+    """
+    Search JSON objects for any keyword from cleaned query.
+
+    Args:
+        data (list[dict]): List of JSON objects.
+        query (str): User query string.
+        haystacks (list[str], optional): Precomputed flatten_json_object()
+            output for each object in data.
+
+    Returns:
+        list[dict]: List of matched JSON objects.
+    """
+    if haystacks is None:
+        haystacks = [flatten_json_object(obj) for obj in data]
 
-    return matched
+    return [data[i] for i in search_json_indices(haystacks, query)]
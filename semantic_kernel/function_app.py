@@ -9,6 +9,7 @@ import requests  # For fetching data from the external API
 
 from core.agents import get_agents
 from core.plugins import SiteTasksPlugin
+from core.utils import load_site_tasks_data
 # Semantic Kernel Imports
 from semantic_kernel.agents import HandoffOrchestration
 from semantic_kernel.agents.runtime import InProcessRuntime
@@ -140,7 +141,7 @@ async def skAgenticPoCFunc(req: func.HttpRequest) -> func.HttpResponse:
         # logging.info(f"Attempting to fetch data from: {data_api_url}")
         # api_response = requests.get(data_api_url, headers=headers, timeout=120)
         # api_response.raise_for_status() # Raise an HTTPError for bad responses (4xx or 5xx)
-        site_tasks_data = json.load(open("knowledge/data.json"))
+        site_tasks_data = load_site_tasks_data("knowledge/data.json")
         logging.info("Successfully fetched data from external API.")
 
         # 2. Invoke the Semantic Kernel multi-agent system
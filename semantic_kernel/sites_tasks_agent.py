@@ -2,7 +2,8 @@ import asyncio
 import json
 import logging
 import os
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
 from semantic_kernel.agents import HandoffOrchestration
 from semantic_kernel.agents.runtime import InProcessRuntime
@@ -15,15 +16,12 @@ from semantic_kernel.utils.logging import setup_logging
 from dotenv import load_dotenv;load_dotenv()
 
 
-# Global variable to hold the loaded data, as plugins need access to it.
-# In a more robust system, this might be managed via dependency injection or a service layer.
-all_data: Dict[str, Any] = {}
-
 setup_logging()
 logging.getLogger("kernel").setLevel(logging.DEBUG)
 
-from core.agents import get_agents
+from core.agents import get_agents, warm_llm_service
 from core.plugins import SiteTasksPlugin
+from core.utils import load_site_tasks_data
 
 
 def agent_response_callback(message: ChatMessageContent) -> None:
@@ -46,61 +44,140 @@ def agent_response_callback(message: ChatMessageContent) -> None:
 
 async def human_response_function() -> ChatMessageContent:
     """Function to get human input when an agent requests it (e.g., for clarification)."""
-    user_input = input("Agent requires input. User: ")
+    user_input = await asyncio.to_thread(input, "Agent requires input. User: ")
     return ChatMessageContent(role=AuthorRole.USER, content=user_input)
 
 
-async def run_semantic_kernel_agent_query(user_query: str, context_json_path: str) -> str:
+def build_handoff_orchestration(data: Dict[str, Any]) -> HandoffOrchestration:
     """
-    Main function to run the Semantic Kernel handoff orchestration.
+    Create the kernel, plugin and agents for the given dataset and wire them into a handoff orchestration.
     """
-    global all_data 
-
-    # Load JSON data from file (only once if not already loaded)
-    if not all_data: # Load only if empty
-        try:
-            with open(context_json_path, 'r', encoding='utf-8') as f:
-                all_data = json.load(f)
-            print(f"Successfully loaded data from {context_json_path}")
-        except FileNotFoundError:
-            print(f"Error: The file '{context_json_path}' was not found.")
-            return "Error: Data file not found."
-        except json.JSONDecodeError:
-            print(f"Error: Could not decode JSON from '{context_json_path}'. Check file format.")
-            return "Error: Invalid JSON data."
-        except Exception as e:
-            print(f"An unexpected error occurred while loading data: {e}")
-            return "Error: Data loading failed."
-
-    # Initialize the Kernel
     kernel = Kernel()
-
-    # Create the plugin instance with the loaded data
-    data_plugin_instance = SiteTasksPlugin(all_data)
-
-    # 1. Create agents and define handoff relationships
+    data_plugin_instance = SiteTasksPlugin(data)
     agents, handoffs = get_agents(kernel, data_plugin_instance)
-    handoff_orchestration = HandoffOrchestration(
+    return HandoffOrchestration(
         members=agents,
         handoffs=handoffs,
         agent_response_callback=agent_response_callback,
     )
 
-    # 2. Create a runtime and start it
-    runtime = InProcessRuntime() 
-    runtime.start()
 
+@lru_cache(maxsize=4)
+def _load_data(path: str, mtime: float) -> Dict[str, Any]:
+    # Keyed on the file's mtime, so edits to the file are picked up on the next query
+    return load_site_tasks_data(path)
+
+
+@lru_cache(maxsize=1)
+def _get_orchestration(path: str, mtime: float) -> HandoffOrchestration:
+    # Same key as _load_data: the orchestration is rebuilt only when the data file changes
+    return build_handoff_orchestration(_load_data(path, mtime))
+
+
+# Every orchestration invoke registers its member actors and subscriptions on the runtime and
+# nothing unregisters them, so each runtime takes at most this many queries before it is replaced.
+RUNTIME_MAX_QUERIES = int(os.getenv("RUNTIME_MAX_QUERIES") or 50)
+
+
+class _SharedRuntime:
+    """A started runtime with how many queries it has taken and how many still run on it."""
+    __slots__ = ("runtime", "queries", "active")
+
+    def __init__(self) -> None:
+        self.runtime = InProcessRuntime()
+        self.runtime.start()
+        self.queries = 0
+        self.active = 0
+
+
+# The runtime new queries start on; created on first use
+_current_runtime: Optional[_SharedRuntime] = None
+
+
+def _acquire_runtime() -> _SharedRuntime:
+    global _current_runtime
+    if _current_runtime is None or _current_runtime.queries >= RUNTIME_MAX_QUERIES:
+        # A full runtime is retired, not stopped: queries still running on it finish there
+        # and the last of them stops it in _release_runtime()
+        _current_runtime = _SharedRuntime()
+    shared = _current_runtime
+    shared.queries += 1
+    shared.active += 1
+    return shared
+
+
+async def _release_runtime(shared: _SharedRuntime) -> None:
+    global _current_runtime
+    shared.active -= 1
+    if shared.active == 0 and shared.queries >= RUNTIME_MAX_QUERIES:
+        if _current_runtime is shared:
+            _current_runtime = None
+        # Drops the actors and chat histories accumulated on it
+        await shared.runtime.stop_when_idle()
+
+
+async def shutdown_runtime() -> None:
+    """
+    Stop the shared runtime once it is idle, if it was started.
+    """
+    global _current_runtime
+    if _current_runtime is not None:
+        shared, _current_runtime = _current_runtime, None
+        await shared.runtime.stop_when_idle()
+        print("Runtime stopped.")
+
+
+async def _invoke(handoff_orchestration: HandoffOrchestration, user_query: str, runtime: InProcessRuntime) -> Any:
     print(f"\n--- Initiating Semantic Kernel with query: '{user_query}' ---")
-    
-    # 3. Invoke the orchestration with the user's query
+
+    # 3. Invoke the orchestration with the user's query and wait for its result
     orchestration_result = await handoff_orchestration.invoke(
         task=user_query,
         runtime=runtime,
     )
+    return await orchestration_result.get()
+
+
+async def run_semantic_kernel_agent_query(
+    user_query: str,
+    context_json_path: str,
+    runtime: Optional[InProcessRuntime] = None,
+) -> str:
+    """
+    Main function to run the Semantic Kernel handoff orchestration.
+    Uses the shared runtime unless one is passed in. After RUNTIME_MAX_QUERIES queries
+    the shared runtime is swapped for a fresh one, and the old one is stopped as soon
+    as its own in-flight queries finish.
+    """
+    # Load JSON data from file (cached until the file changes)
+    try:
+        mtime = os.path.getmtime(context_json_path)
+        _load_data(context_json_path, mtime)
+    except FileNotFoundError:
+        print(f"Error: The file '{context_json_path}' was not found.")
+        return "Error: Data file not found."
+    except json.JSONDecodeError:
+        print(f"Error: Could not decode JSON from '{context_json_path}'. Check file format.")
+        return "Error: Invalid JSON data."
+    except Exception as e:
+        print(f"An unexpected error occurred while loading data: {e}")
+        return "Error: Data loading failed."
 
-    # 4. Wait for the results
+    # 1. Create agents and define handoff relationships (once per loaded dataset)
+    handoff_orchestration = _get_orchestration(context_json_path, mtime)
+
+    # 2. Reuse the long-lived runtime instead of starting one per query
+    if runtime is None:
+        shared = _acquire_runtime()
+        try:
+            value = await _invoke(handoff_orchestration, user_query, shared.runtime)
+        finally:
+            await _release_runtime(shared)
+    else:
+        value = await _invoke(handoff_orchestration, user_query, runtime)
+
+    # 4. Extract the result text
     final_result_content = ""
-    value = await orchestration_result.get()
     if isinstance(value, ChatMessageContent):
         final_result_content = value.content
     elif isinstance(value, str):
@@ -110,14 +187,26 @@ async def run_semantic_kernel_agent_query(user_query: str, context_json_path: st
     
     print(f"\n--- Final Orchestration Result ---")
     print(final_result_content)
-
-    # 5. Stop the runtime after the invocation is complete
-    await runtime.stop_when_idle()
-    print("Runtime stopped.")
     
     return final_result_content
 
 
+async def run_many(queries: List[str], context_json_path: str, k: int = 8) -> List[str]:
+    """
+    Run a batch of queries concurrently on the shared runtime, at most k at a time.
+    Results are returned in the order of the queries.
+    """
+    semaphore = asyncio.Semaphore(k)
+
+    async def _run_one(query: str) -> str:
+        async with semaphore:
+            return await run_semantic_kernel_agent_query(query, context_json_path)
+
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(_run_one(query)) for query in queries]
+    return [task.result() for task in tasks]
+
+
 async def main():
     """
     Main function to run the interactive agent system.
@@ -125,16 +214,43 @@ async def main():
     # Create a dummy data.json for testing if it doesn't exist
     data_json_path = 'knowledge/data.json'
 
+    try:
+        import readline  # noqa: F401 - enables line editing and history for input()
+    except ImportError:
+        pass
+
+    use_task_queue = os.getenv("USE_TASK_QUEUE", "").lower() in ("1", "true", "yes")
+    if use_task_queue:
+        # Celery is only needed when queueing. The task is sent by name: importing tasks.py
+        # would load this module a second time when it runs as __main__.
+        from celery_app import RUN_QUERY_TASK, app as celery_app
+
+    # Open the LLM connection while the user types the first query; keep a reference so it isn't collected.
+    # In queue mode the workers make the LLM calls, so a warm-up here would only be a billed no-op.
+    warmup = None if use_task_queue else asyncio.create_task(warm_llm_service())
+
     print("\n--- Welcome to the Project Assistant ---")
     print("Type your queries about sites and tasks. Type 'exit' to quit.")
-    
-    while True:
-        user_input = input("\nYou: ")
-        if user_input.lower() == 'exit':
-            print("Exiting Project Assistant. Goodbye!")
-            break
-        
-        await run_semantic_kernel_agent_query(user_input, data_json_path)
+
+    try:
+        while True:
+            # Read input off the event loop so the runtime keeps running meanwhile
+            user_input = await asyncio.to_thread(input, "\nYou: ")
+            if user_input.lower() == 'exit':
+                print("Exiting Project Assistant. Goodbye!")
+                break
+
+            if use_task_queue:
+                # Hand the query to a Celery worker and wait for its result off the loop
+                result = celery_app.send_task(RUN_QUERY_TASK, args=(user_input, data_json_path))
+                print(await asyncio.to_thread(result.get))
+            else:
+                await run_semantic_kernel_agent_query(user_input, data_json_path)
+    finally:
+        if warmup is not None:
+            warmup.cancel()
+        # Stopped here rather than in an atexit hook: the event loop is gone by then
+        await shutdown_runtime()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,32 @@
+import asyncio
+from functools import lru_cache
+
+from celery.signals import worker_process_shutdown
+
+from celery_app import RUN_QUERY_TASK, app
+from sites_tasks_agent import run_semantic_kernel_agent_query, shutdown_runtime
+
+
+@lru_cache(maxsize=1)
+def _worker_loop() -> asyncio.AbstractEventLoop:
+    # One loop per worker process: the cached runtime and agents are bound to it,
+    # so a fresh asyncio.run() per task would leave them on a closed loop.
+    return asyncio.new_event_loop()
+
+
+@app.task(name=RUN_QUERY_TASK)
+def run_query_task(user_query: str, context_json_path: str = "knowledge/data.json") -> str:
+    """
+    Run one query through the handoff orchestration inside a worker.
+    """
+    return _worker_loop().run_until_complete(
+        run_semantic_kernel_agent_query(user_query, context_json_path)
+    )
+
+
+@worker_process_shutdown.connect
+def _shutdown_worker_runtime(**kwargs) -> None:
+    if _worker_loop.cache_info().currsize:
+        loop = _worker_loop()
+        loop.run_until_complete(shutdown_runtime())
+        loop.close()
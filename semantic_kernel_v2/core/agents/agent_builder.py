@@ -1,10 +1,24 @@
+import os
+from functools import lru_cache
+
 from semantic_kernel.agents import ChatCompletionAgent
+from semantic_kernel.connectors.ai.google.google_ai import \
+    GoogleAIChatCompletion
 
 from semantic_kernel.contents import (AuthorRole, ChatMessageContent,
                                       FunctionCallContent,
                                       FunctionResultContent)
 
 
+@lru_cache(maxsize=1)
+def get_chat_completion_service() -> GoogleAIChatCompletion:
+    # One client for every agent, so connections and auth setup are reused across agents and queries
+    return GoogleAIChatCompletion(
+        gemini_model_id="gemini-1.5-flash",
+        api_key=os.getenv("GOOGLE_API_KEY")
+    )
+
+
 class AgentBuilder(ChatCompletionAgent):
     
     def __init__(
@@ -23,24 +37,25 @@ class AgentBuilder(ChatCompletionAgent):
             plugins=plugins)
     
     async def run(self,user_query: str) -> str:
-        _last_response:str = None
+        _last_response:str = ""
 
         async for response in self.invoke(
             messages=[ChatMessageContent(role=AuthorRole.USER, content=user_query)],
             on_intermediate_message=self._handle_intermediate_steps
         ):
-            _last_response = response.content
+            # response.content is a ChatMessageContent; callers parse the reply text
+            _last_response = str(response.content)
         
         return _last_response
 
     
     async def _handle_intermediate_steps(self, msg: ChatMessageContent) -> None:
-        if any(isinstance(item, FunctionResultContent) for item in msg.items):
-            for fr in msg.items:
-                if isinstance(fr, FunctionResultContent):
-                    print(f"Function Result:> ....... for function: {fr.name}")
-        elif any(isinstance(item, FunctionCallContent) for item in msg.items):
-            for fcc in msg.items:
-                if isinstance(fcc, FunctionCallContent):
-                    print(f"Function Call:> {fcc.name} with arguments: {fcc.arguments}")
-
+        for item in msg.items:
+            if isinstance(item, FunctionResultContent):
+                print(f"Function Result:> ....... for function: {item.name}")
+            elif isinstance(item, FunctionCallContent):
+                # Arguments can be large JSON payloads; truncate for display in the console
+                arguments = str(item.arguments)
+                if len(arguments) > 500:
+                    arguments = f"{arguments[:500]}...(truncated)"
+                print(f"Function Call:> {item.name} with arguments: {arguments}")
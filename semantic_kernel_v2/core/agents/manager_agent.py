@@ -1,22 +1,12 @@
 # core/agents/manager_agent.py
-import os
 import asyncio
 
 # Core AgentBuilder
-from core.agents.agent_builder import AgentBuilder
+from core.agents.agent_builder import AgentBuilder, get_chat_completion_service
 
 # Plugins
 from core.plugins import DelegationPlugin # Import the plugin where DelegationPlugin is defined
 
-# LLM Service (assuming this setup is common and can be imported or passed in)
-from semantic_kernel.connectors.ai.google.google_ai import GoogleAIChatCompletion
-
-# Global LLM service instance (reusing the common pattern from sites_tasks_agent)
-_manager_chat_completion_service = GoogleAIChatCompletion(
-    gemini_model_id="gemini-1.5-flash", # Could use a different model for manager if desired
-    api_key=os.getenv("GOOGLE_API_KEY")
-)
-
 # Instructions for the Manager Agent
 manager_orchestrator_instructions = (
     """You are a top-level AI Project Orchestrator. Your primary role is to understand complex user queries and
@@ -45,7 +35,7 @@ class ManagerAgent(AgentBuilder):
             name="ProjectManagerAgent",
             description="Orchestrates various specialized agents to answer complex project-related queries.",
             instructions=manager_orchestrator_instructions,
-            service=_manager_chat_completion_service,
+            service=get_chat_completion_service(), # Shared with the Sites & Tasks Agent
             plugins=[delegation_plugin_instance] # Register the delegation plugin
         )
 
@@ -60,7 +50,8 @@ async def main():
     print("Type your queries about sites and tasks. Type 'exit' to quit.")
     
     while True:
-        user_input = input("\nYou: ")
+        # Read input off the event loop so background work keeps running meanwhile
+        user_input = await asyncio.to_thread(input, "\nYou: ")
         if user_input.lower() == 'exit':
             print("Exiting Project Assistant. Goodbye!")
             break
@@ -1,70 +1,48 @@
 import asyncio
-import json
-import os
-
-from semantic_kernel.connectors.ai.google.google_ai import \
-    GoogleAIChatCompletion
+from pathlib import Path
+from typing import Any, Dict
 
 from core.plugins.sites_tasks_plugin import SiteTasksPlugin
+from core.utils import load_json_file
 
-from .agent_builder import AgentBuilder
-
-orchestrator_instructions = (
-        """You are an advanced AI Project Assistant. Your primary role is to understand user queries about sites and tasks, 
-        and use the provided tools (plugins) to retrieve or synthesize the requested information. 
-        You are the sole decision-maker for which tool to use, if any, and how to format the final response.
-
-        **Available Tools (Plugins):**
-        - `get_site_details(site_query: str)`: Use this when the user asks for **details of a specific site** (e.g., "Show me site ATH2", "Details for Maroussi?").
-        - `search_sites(query: str)`: Use this when the user asks to **list sites based on attributes** or a partial name (e.g., "List all sites in Bangalore", "Show me sites with status Active"). This can also be used to "list all sites" by providing a broad query like "all" or "active".
-        - `get_task_details(task_query: str)`: Use this when the user asks for **details of a specific task** (e.g., "What is task T1?", "Show me progress of task 123").
-        - `get_tasks_for_site(site_query: str)`: Use this when the user asks for **tasks associated with a specific site** (e.g., "tasks for site ATH2", "What tasks are at Bangalore Tech Park?").
-        - `get_all_data_json()`: Use this when the user asks for **overall/aggregate information across the dataset**, an **executive summary**, or to **list all data/sites** for analysis that requires the entire dataset. You will then process this JSON yourself.
+from .agent_builder import AgentBuilder, get_chat_completion_service
 
-        **General Instructions & Response Formatting:**
-        - **Accuracy:** Always strive for factual accuracy based on the data retrieved from your tools.
-        - **Clarity:** Provide clear, concise, and easy-to-understand responses.
-        - **Markdown Output:** All your responses should be formatted in Markdown. Never return raw JSON or code blocks in your final response to the user, unless explicitly asked to show the raw data.
-        - **Site Details Formatting (for `get_site_details` results):** Present information as a list:
-            `- location_name: [name]`
-            `- site_id: [id]`
-            `- status: [status value from 'state']`
-            `- Phase: [value from 'latitude']`
-            `- Company Size: [value from 'address_2']`
-        - **Site List Formatting (for `search_sites` results or 'list all'):** Provide a formatted Markdown list.
-        - **Task Details Formatting (for `get_task_details` results):** Extract key information from the returned JSON and present it in a readable Markdown list or paragraph.
-        - **Tasks for Site Formatting (for `get_tasks_for_site` results):** Provide a formatted Markdown list of tasks.
-        - **Overall/Summary/List All (using `get_all_data_json`):**
-            - **Overall/Aggregate:** After calling `get_all_data_json`, parse the JSON, perform the requested aggregation (e.g., count active sites, total tasks), and present the numerical result clearly.
-            - **Summary:** After calling `get_all_data_json`, analyze the JSON to provide a high-level executive summary, including: a short description of the data, task details summary, site states, task statuses, total sites, and total tasks (with their statuses). Remember to relabel "latitude" as "Phase" and "address_2" as "Company Size" in your summary if referring to those concepts.
-            - **List All Sites:** After calling `get_all_data_json`, iterate through all sites and list them with their 'location_name', 'site_id', and 'status'.
-        - **Clarification:** If the user's request is ambiguous, unclear, or you cannot fulfill it with your tools or current data, ask for clarification by politely stating: "I need more information to help you. Could you please specify your request?"
-        - **Error Handling:** If a tool returns an error or no data, inform the user appropriately.
-        """
-    )
+# Loaded once at import and shared by every SitesTasksAgent
+PROMPTS_DIR = Path(__file__).parent / "prompts"
+orchestrator_instructions = (PROMPTS_DIR / "orchestrator.md").read_text(encoding="utf-8")
 
 data_json_path = "knowledge/data.json"
 
-with open(data_json_path, 'r', encoding='utf-8') as f:
-        global_site_tasks_data = json.load(f)
+# The one cache of parsed data files, filled by load_data() or load_data_async()
+_loaded: Dict[str, Any] = {}
+_load_lock = asyncio.Lock()
 
-data_plugin = SiteTasksPlugin(global_site_tasks_data)
+def load_data(path: str):
+    # Parsed on first use and shared for the rest of the process, not at import time
+    if path not in _loaded:
+        _loaded[path] = load_json_file(path)
+    return _loaded[path]
 
-chat_completion_service = GoogleAIChatCompletion(
-    gemini_model_id="gemini-1.5-flash",
-    api_key=os.getenv("GOOGLE_API_KEY")
-)
+async def load_data_async(path: str = data_json_path):
+    # Concurrent first callers wait on one read, parsed off the event loop
+    if path not in _loaded:
+        async with _load_lock:
+            if path not in _loaded:
+                await asyncio.to_thread(load_data, path)
+    return _loaded[path]
 
 class SitesTasksAgent(AgentBuilder):
      def __init__(
                 self, 
-                context,
+                context=None,
                 name="ProjectAssistantOrchestrator",
                 description="A comprehensive AI assistant for project site and task management.", 
                 instruction=orchestrator_instructions, 
-                service=chat_completion_service
+                service=None
                 ):
         
-        data_plugin = SiteTasksPlugin(context)
-        super().__init__(name=name,description=description,instructions=instruction,service=service,plugins=[data_plugin])  
+        # Without a context this reads through the same cache as load_data_async(), so a
+        # dataset already loaded by the delegation path is not read again
+        data_plugin = SiteTasksPlugin(load_data(data_json_path) if context is None else context)
+        super().__init__(name=name,description=description,instructions=instruction,service=service or get_chat_completion_service(),plugins=[data_plugin])  
 
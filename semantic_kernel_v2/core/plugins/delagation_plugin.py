@@ -1,9 +1,47 @@
 # Semantic Kernel Imports
 from semantic_kernel.functions import kernel_function
 
-from core.agents.sites_tasks_agent import SitesTasksAgent
+from core.agents.sites_tasks_agent import (SitesTasksAgent, data_json_path,
+                                           load_data_async)
+
+import asyncio
+import logging
+import re
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+# The package sets the "kernel" logger to DEBUG; keep the per-call trace here quiet by default
+logger.setLevel(logging.INFO)
+
+# Delegations arriving within MAX_WAIT seconds of each other share one agent call, up to MAX_BATCH
+MAX_BATCH = 8
+MAX_WAIT = 0.02
+
+_ANSWER_HEADING = re.compile(r"^### Answer (\d+)\s*$", re.MULTILINE)
+
+
+def build_batched_prompt(queries: List[str]) -> str:
+    numbered = "\n".join(f"{i}) {query}" for i, query in enumerate(queries, start=1))
+    return (
+        "Answer each of the following queries independently.\n"
+        "Start each answer with a line '### Answer <number>' matching the query number, "
+        "and answer every query in order.\n\n"
+        f"Queries:\n{numbered}"
+    )
+
+
+def split_batched_answers(response: str, count: int) -> Optional[List[str]]:
+    """
+    Split a reply to build_batched_prompt() into one answer per query.
+    Returns None if the reply does not contain exactly the expected answer headings.
+    """
+    parts = _ANSWER_HEADING.split(response or "")
+    # parts = [preamble, number, answer, number, answer, ...]
+    numbers = [int(n) for n in parts[1::2]]
+    if numbers != list(range(1, count + 1)):
+        return None
+    return [answer.strip() for answer in parts[2::2]]
 
-import json
 
 class DelegationPlugin:
     """
@@ -11,6 +49,12 @@ class DelegationPlugin:
     This enables a higher-level Manager Agent to delegate tasks.
     """
 
+    def __init__(self):
+        # Created on first use: the agent needs the loaded data, the queue a running event loop
+        self._agent: Optional[SitesTasksAgent] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
     @kernel_function(
         name="call_sites_tasks_agent",
         description="Delegates a query to the Sites & Tasks Agent to retrieve information about sites and their associated tasks. Use this for any query specifically related to site details, searching sites, task details, or tasks for a specific site.",
@@ -25,20 +69,67 @@ class DelegationPlugin:
         Returns:
             str: The response from the Sites & Tasks Agent.
         """
-        print(f"\nDelegating query '{query}' to Sites & Tasks Agent...")
+        logger.debug("Delegating query '%s' to Sites & Tasks Agent...", query)
         try:
-            # this should be an api call in prod
-            context = await self.simulate_api_call()
-            sites_tasks_agent = SitesTasksAgent(context)
-            agent_response = await sites_tasks_agent.run(query)
-            
+            future = asyncio.get_running_loop().create_future()
+            await self._get_queue().put((query, future))
+            agent_response = await future
+
             return f"Sites & Tasks Agent responded:\n{agent_response}"
         except Exception as e:
             error_message = f"Error delegating to Sites & Tasks Agent: {e}"
-            print(f"ERROR: {error_message}")
+            logger.error(error_message)
             return error_message
 
-    async def simulate_api_call(self,path="knowledge/data.json"):
-        with open(path, 'r', encoding='utf-8') as f:
-            global_site_tasks_data = json.load(f)
-        return global_site_tasks_data
+    def _get_queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._batch_worker())
+        return self._queue
+
+    async def _get_agent(self) -> SitesTasksAgent:
+        if self._agent is None:
+            # this should be an api call in prod
+            context = await self.simulate_api_call()
+            self._agent = SitesTasksAgent(context)
+        return self._agent
+
+    async def _batch_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + MAX_WAIT
+            while len(batch) < MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._run_batch(batch)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        queries = [query for query, _ in batch]
+        try:
+            agent = await self._get_agent()
+            if len(queries) == 1:
+                answers = [await agent.run(queries[0])]
+            else:
+                logger.debug("Batching %d delegated queries into one agent call", len(queries))
+                answers = split_batched_answers(await agent.run(build_batched_prompt(queries)), len(queries))
+                if answers is None:
+                    # The combined reply could not be split reliably; answer each query on its own
+                    answers = await asyncio.gather(*(agent.run(query) for query in queries))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), answer in zip(batch, answers):
+            if not future.done():
+                future.set_result(answer)
+
+    async def simulate_api_call(self,path=data_json_path):
+        return await load_data_async(path)
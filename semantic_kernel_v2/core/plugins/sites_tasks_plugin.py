@@ -1,11 +1,34 @@
-import json
 import logging
-from typing import Any, Dict
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # Semantic Kernel Imports
 from semantic_kernel.functions import kernel_function
 
-from core.utils import search_json_objects
+from core.utils import (TrieNode, build_field_columns, build_prefix_trie,
+                        build_search_haystacks, dumps_compact, normalize_key,
+                        search_field_columns, search_json_objects,
+                        search_json_positions, search_prefix_positions)
+
+# Fields tokenized into the prefix tries; the site fields are also kept as columns
+SITE_SEARCH_FIELDS = ("location_name", "site_id", "state", "latitude", "address_2")
+TASK_SEARCH_FIELDS = ("task_sys_id", "classification")
+
+# Output templates, filled with format_map over the record; missing fields render as N/A
+_SITE_DETAILS_TMPL = (
+    "- location_name: {location_name}\n"
+    "- site_id: {site_id}\n"
+    "- status: {state}\n"
+    "- Phase: {latitude}\n"
+    "- Company Size: {address_2}"
+)
+_SITE_TMPL = "- **{location_name}** (ID: {site_id}) - Status: {state}\n"
+_TASK_TMPL = "- **Task ID:** {task_sys_id} - **Classification:** {classification}\n"
+
+
+def _with_defaults(record: Dict[str, Any]) -> "defaultdict[str, Any]":
+    return defaultdict(lambda: "N/A", record)
 
 
 class SiteTasksPlugin:
@@ -14,9 +37,151 @@ class SiteTasksPlugin:
     The entire dataset is passed to its constructor.
     """
     _all_data: Dict[str, Any]
-
-    def __init__(self, all_data_param: Dict[str, Any]):
+    _sites: Tuple[Dict[str, Any], ...]
+    _site_ids: Tuple[str, ...]
+    _location_names: Tuple[str, ...]
+    _states: Tuple[str, ...]
+    _latitudes: Tuple[str, ...]
+    _address_2s: Tuple[str, ...]
+    _site_columns: Tuple[Tuple[str, ...], ...]
+    _site_haystacks: Tuple[str, ...]
+    _task_haystacks: Tuple[str, ...]
+    _by_site_id: Dict[str, Dict[str, Any]]
+    _by_location: Dict[str, Dict[str, Any]]
+    _all_tasks: List[Dict[str, Any]]
+    _task_json: Tuple[str, ...]
+    _by_task_sys_id: Dict[str, int]
+    _by_classification: Dict[str, int]
+    _all_data_json: str
+    _sites_trie: TrieNode
+    _tasks_trie: TrieNode
+    _site_details_cache: Callable[[str], str]
+    _search_sites_cache: Callable[[str], str]
+    _task_details_cache: Callable[[str], str]
+    _tasks_for_site_cache: Callable[[str], str]
+
+    def __init__(self, all_data_param: Dict[str, Any]) -> None:
         self._all_data = all_data_param
+        # The dataset never changes, so it is serialized once rather than per get_all_data_json call
+        self._all_data_json = dumps_compact(all_data_param)
+        # Sites are kept only for retrieval by position; filters scan the per-field columns below
+        self._sites = tuple(all_data_param.get("data", []))
+        self._site_columns = build_field_columns(self._sites, SITE_SEARCH_FIELDS)
+        (self._location_names, self._site_ids, self._states,
+         self._latitudes, self._address_2s) = self._site_columns
+
+        # Exact-match lookups from case-folded ID/name to site; the first occurrence wins
+        self._by_site_id = {}
+        self._by_location = {}
+        # Every task enriched with its parent site, built once instead of copied per call
+        self._all_tasks = []
+        self._by_task_sys_id = {}
+        self._by_classification = {}
+        for site in self._sites:
+            if site.get("site_id"):
+                self._by_site_id.setdefault(normalize_key(site["site_id"]), site)
+            if site.get("location_name"):
+                self._by_location.setdefault(normalize_key(site["location_name"]), site)
+
+            if isinstance(site.get("request_tasks"), list):
+                for task in site["request_tasks"]:
+                    task_with_site_context: Dict[str, Any] = {
+                        **task,
+                        "parent_site_id": site.get("site_id"),
+                        "parent_site_name": site.get("location_name"),
+                    }
+                    position = len(self._all_tasks)
+                    self._all_tasks.append(task_with_site_context)
+                    if task.get("task_sys_id"):
+                        self._by_task_sys_id.setdefault(normalize_key(task["task_sys_id"]), position)
+                    if task.get("classification"):
+                        self._by_classification.setdefault(normalize_key(task["classification"]), position)
+
+        # Task details are returned as JSON, so each task is serialized once up front
+        self._task_json = tuple(dumps_compact(task) for task in self._all_tasks)
+
+        # Prefix tries over the searchable fields; multi-word queries intersect per-token matches
+        self._sites_trie = build_prefix_trie(self._sites, SITE_SEARCH_FIELDS)
+        self._tasks_trie = build_prefix_trie(self._all_tasks, TASK_SEARCH_FIELDS)
+        # Case-folded dumps parallel to the records, so the fallback scan only walks strings
+        self._site_haystacks = build_search_haystacks(self._sites)
+        self._task_haystacks = build_search_haystacks(self._all_tasks)
+
+        # The dataset is read-only, so tool results are memoized per query string
+        self._site_details_cache = lru_cache(maxsize=256)(self._lookup_site_details)
+        self._search_sites_cache = lru_cache(maxsize=256)(self._lookup_sites)
+        self._task_details_cache = lru_cache(maxsize=256)(self._lookup_task_details)
+        self._tasks_for_site_cache = lru_cache(maxsize=256)(self._lookup_tasks_for_site)
+
+    def _search_sites(self, query: str) -> List[Dict[str, Any]]:
+        # Token prefixes first, then substrings within the indexed field columns; queries that
+        # match none of the indexed fields keep the full-record keyword search
+        positions = (search_prefix_positions(self._sites_trie, query)
+                     or search_field_columns(self._site_columns, query))
+        if positions:
+            return [self._sites[i] for i in positions]
+        return search_json_objects(self._sites, query, self._site_haystacks)
+
+    def _search_task_positions(self, query: str) -> List[int]:
+        return (search_prefix_positions(self._tasks_trie, query)
+                or search_json_positions(self._task_haystacks, query))
+
+    def _find_site(self, site_query: str) -> Optional[Dict[str, Any]]:
+        key: str = normalize_key(site_query)
+        return self._by_site_id.get(key) or self._by_location.get(key)
+
+    @staticmethod
+    def _format_site_details(site: Dict[str, Any]) -> str:
+        return _SITE_DETAILS_TMPL.format_map(_with_defaults(site))
+
+    def _lookup_site_details(self, site_query: str) -> str:
+        # Exact ID/name hit first; the search only runs when it misses
+        site_found = self._find_site(site_query)
+        if site_found:
+            return self._format_site_details(site_found)
+
+        filtered_sites = self._search_sites(site_query)
+        if not filtered_sites:
+            return f"No site found matching '{site_query}'. Please clarify the site ID or name."
+        return self._format_site_details(filtered_sites[0]) # Take the first if no exact match but results exist
+
+    def _lookup_sites(self, query: str) -> str:
+        filtered_sites = self._search_sites(query)
+
+        if not filtered_sites:
+            return f"No sites found matching the criteria: '{query}'."
+
+        return "### Found Sites:\n\n" + "".join(
+            _SITE_TMPL.format_map(_with_defaults(site)) for site in filtered_sites
+        )
+
+    def _lookup_task_details(self, task_query: str) -> str:
+        # Prioritize exact match on task_sys_id or classification; the search only runs when it misses
+        key: str = normalize_key(task_query)
+        position = self._by_task_sys_id.get(key)
+        if position is None:
+            position = self._by_classification.get(key)
+        if position is None:
+            positions = self._search_task_positions(task_query)
+
+            if not positions:
+                return f"No task found matching '{task_query}'. Please clarify the task ID or description."
+            position = positions[0] # Take the first if no exact match but results exist
+
+        return self._task_json[position] # Return full JSON for a single task
+
+    def _lookup_tasks_for_site(self, site_query: str) -> str:
+        site_found = self._find_site(site_query)
+        if not site_found:
+            return f"No site found matching '{site_query}'. Cannot list tasks."
+
+        tasks = site_found.get("request_tasks", [])
+        if not tasks:
+            return f"No tasks found for site '{site_found.get('location_name', site_query)}' (ID: {site_found.get('site_id', 'N/A')})."
+
+        header = f"### Tasks for Site '{site_found.get('location_name', site_query)}' (ID: {site_found.get('site_id', 'N/A')}):\n\n"
+        # Updated fields here from task_id/description to task_sys_id/classification
+        return header + "".join(_TASK_TMPL.format_map(_with_defaults(task)) for task in tasks)
 
     @kernel_function(
         name="get_site_details",
@@ -27,30 +192,7 @@ class SiteTasksPlugin:
         Retrieves details for a specific site from the loaded data.
         Assumes site_query is a specific ID or name for a single site.
         """
-        sites = self._all_data.get("data", [])
-        filtered_sites = search_json_objects(sites, site_query)
-
-        if not filtered_sites:
-            return f"No site found matching '{site_query}'. Please clarify the site ID or name."
-        
-        site_found = None
-        for site in filtered_sites:
-            if site.get("site_id", "").lower() == site_query.lower() or site.get("location_name", "").lower() == site_query.lower():
-                site_found = site
-                break
-        if not site_found and filtered_sites:
-            site_found = filtered_sites[0] # Take the first if no exact match but results exist
-
-
-        if site_found:
-            return (
-                f"- location_name: {site_found.get('location_name', 'N/A')}\n"
-                f"- site_id: {site_found.get('site_id', 'N/A')}\n"
-                f"- status: {site_found.get('state', 'N/A')}\n"
-                f"- Phase: {site_found.get('latitude', 'N/A')}\n"
-                f"- Company Size: {site_found.get('address_2', 'N/A')}"
-            )
-        return f"No relevant site found for '{site_query}' within the provided data."
+        return self._site_details_cache(site_query)
 
     @kernel_function(
         name="search_sites",
@@ -60,18 +202,7 @@ class SiteTasksPlugin:
         """
         Searches for sites based on a general query and returns a formatted list.
         """
-        sites = self._all_data.get("data", [])
-        filtered_sites = search_json_objects(sites, query)
-
-        if not filtered_sites:
-            return f"No sites found matching the criteria: '{query}'."
-
-        output = "### Found Sites:\n\n"
-        for site in filtered_sites:
-            output += (
-                f"- **{site.get('location_name', 'N/A')}** (ID: {site.get('site_id', 'N/A')}) - Status: {site.get('state', 'N/A')}\n"
-            )
-        return output
+        return self._search_sites_cache(query)
 
     @kernel_function(
         name="get_task_details",
@@ -82,33 +213,7 @@ class SiteTasksPlugin:
         Retrieves details for a specific task.
         Updated to use 'task_sys_id' and 'classification' for searching and to return full JSON.
         """
-        all_tasks = []
-        for site in self._all_data.get("data", []):
-            if "request_tasks" in site and isinstance(site["request_tasks"], list):
-                for task in site["request_tasks"]:
-                    task_with_site_context = task.copy()
-                    task_with_site_context['parent_site_id'] = site.get('site_id')
-                    task_with_site_context['parent_site_name'] = site.get('location_name')
-                    all_tasks.append(task_with_site_context)
-        
-        # Use the updated search_json_objects which now considers task_sys_id
-        filtered_tasks = search_json_objects(all_tasks, task_query)
-
-        if not filtered_tasks:
-            return f"No task found matching '{task_query}'. Please clarify the task ID or description."
-
-        task_found = None
-        for task in filtered_tasks:
-            # Prioritize exact match on task_sys_id or classification
-            if task.get("task_sys_id", "").lower() == task_query.lower() or task.get("classification", "").lower() == task_query.lower():
-                task_found = task
-                break
-        if not task_found and filtered_tasks:
-            task_found = filtered_tasks[0] # Take the first if no exact match but results exist
-
-        if task_found:
-            return json.dumps(task_found, indent=2) # Return full JSON for a single task
-        return f"No relevant task found for '{task_query}'."
+        return self._task_details_cache(task_query)
 
     @kernel_function(
         name="get_tasks_for_site",
@@ -119,29 +224,8 @@ class SiteTasksPlugin:
         Lists all tasks associated with a specific site.
         Updated to use 'task_sys_id' and 'classification'.
         """
-        sites = self._all_data.get("data", [])
-        
-        site_found = None
-        for site in sites:
-            if site.get("site_id", "").lower() == site_query.lower() or site.get("location_name", "").lower() == site_query.lower():
-                site_found = site
-                break
-
-        if not site_found:
-            return f"No site found matching '{site_query}'. Cannot list tasks."
-
-        tasks = site_found.get("request_tasks", [])
-        if not tasks:
-            return f"No tasks found for site '{site_found.get('location_name', site_query)}' (ID: {site_found.get('site_id', 'N/A')})."
+        return self._tasks_for_site_cache(site_query)
 
-        output = f"### Tasks for Site '{site_found.get('location_name', site_query)}' (ID: {site_found.get('site_id', 'N/A')}):\n\n"
-        for task in tasks:
-            # Updated fields here from task_id/description to task_sys_id/classification
-            output += (
-                f"- **Task ID:** {task.get('task_sys_id', 'N/A')} - **Classification:** {task.get('classification', 'N/A')}\n"
-            )
-        return output
-    
     @kernel_function(
         name="get_all_data_json",
         description="Returns the entire loaded JSON dataset containing all sites and their associated tasks. Use this for aggregation, summarization, or listing all entries.",
@@ -150,4 +234,4 @@ class SiteTasksPlugin:
         """
         Returns the entire JSON dataset as a string.
         """
-        return json.dumps(self._all_data, indent=2)
+        return self._all_data_json
@@ -1,9 +1,17 @@
 import json
+import mmap
 import re
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
 
-def load_stopwords_from_file(file_path: str) -> set:
-    reconstructed_stopwords = set()
+
+def load_stopwords_from_file(file_path: str) -> Set[str]:
+    reconstructed_stopwords: Set[str] = set()
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             for line in f:
@@ -16,20 +24,178 @@ def load_stopwords_from_file(file_path: str) -> set:
 
 all_stopwords = load_stopwords_from_file("knowledge/stopwords.txt")
 
-def search_json_objects(data, query):
+def load_json_file(file_path: str) -> Any:
     """
-    Search JSON objects for any keyword from cleaned query.
+    Parse a JSON file through a read-only memory map, with orjson when installed.
+    """
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if orjson is not None:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+        return json.loads(mm[:])
+
+def normalize_key(value: str) -> str:
+    """
+    Case-fold a lookup key or query. Interned, so index keys and queries compare by identity first.
+    """
+    return sys.intern(value.casefold())
+
+
+def dumps_compact(obj: Any) -> str:
+    """
+    Serialize to minified JSON for tool results; indentation only costs LLM tokens.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def extract_keywords(query: str) -> List[str]:
+    """Tokenize a query and drop stopwords."""
+    tokens = re.findall(r'\w+', query.casefold())
+    return [t for t in tokens if t not in all_stopwords]
+
+
+class TrieNode:
+    """
+    Prefix trie node. ids holds every record with a token under this prefix,
+    so a prefix lookup never has to walk the subtree.
+    """
+    __slots__ = ("children", "ids")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "TrieNode"] = {}
+        self.ids: Set[int] = set()
+
+
+def build_prefix_trie(records: Sequence[Dict[str, Any]], fields: Sequence[str]) -> TrieNode:
+    """
+    Build a case-folded prefix trie over the tokens of the given fields of each record.
 
     Args:
-        data (list[dict]): List of JSON objects.
+        records (list[dict]): JSON objects to index.
+        fields (list[str]): Keys whose values are tokenized.
+
+    Returns:
+        TrieNode: Root of the trie; ids are positions in records.
+    """
+    root: TrieNode = TrieNode()
+    for position, record in enumerate(records):
+        for field in fields:
+            value = record.get(field)
+            if value is None:
+                continue
+            for token in re.findall(r'\w+', str(value).casefold()):
+                node = root
+                for char in token:
+                    child = node.children.get(char)
+                    if child is None:
+                        child = node.children[char] = TrieNode()
+                    node = child
+                    node.ids.add(position)
+    return root
+
+
+def trie_prefix_search(root: TrieNode, prefix: str) -> Set[int]:
+    """Return the positions of the records with a token starting with prefix."""
+    node: TrieNode = root
+    for char in prefix:
+        child = node.children.get(char)
+        if child is None:
+            return set()
+        node = child
+    return node.ids
+
+
+def search_prefix_positions(root: TrieNode, query: str) -> List[int]:
+    """
+    Return the positions of the records matching every keyword of the query as a token prefix.
+
+    Args:
+        root (TrieNode): Output of build_prefix_trie().
         query (str): User query string.
 
     Returns:
-        list[dict]: List of matched JSON objects.
+        list[int]: Matching positions in ascending order.
+    """
+    keywords = extract_keywords(query)
+    if not keywords:
+        return []
+
+    return sorted(set.intersection(*(trie_prefix_search(root, k) for k in keywords)))
+
+
+def search_prefix_trie(root: TrieNode, records: Sequence[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
+    """
+    Return the records matching every keyword of the query as a token prefix.
+
+    Args:
+        root (TrieNode): Output of build_prefix_trie() over records.
+        records (list[dict]): The indexed JSON objects.
+        query (str): User query string.
+
+    Returns:
+        list[dict]: Matched JSON objects, in their original order.
+    """
+    return [records[i] for i in search_prefix_positions(root, query)]
+
+def build_field_columns(
+    records: Sequence[Dict[str, Any]], fields: Sequence[str]
+) -> Tuple[Tuple[str, ...], ...]:
+    """
+    One case-folded column per field, parallel to records (structure of arrays).
+    Missing and null values become empty strings.
+    """
+    return tuple(
+        tuple(sys.intern(str(value).casefold()) if (value := record.get(field)) is not None else ""
+              for record in records)
+        for field in fields
+    )
+
+
+def search_field_columns(columns: Sequence[Sequence[str]], query: str) -> List[int]:
+    """
+    Return the positions whose value in any column contains any keyword from the cleaned query.
+
+    Args:
+        columns (list[list[str]]): build_field_columns() output.
+        query (str): User query string.
+
+    Returns:
+        list[int]: Matching positions in ascending order.
+    """
+    keywords = extract_keywords(query)
+    if not keywords:
+        return []
+
+    # Column by column: each pass walks one flat tuple of strings rather than every record dict
+    matched: Set[int] = set()
+    for column in columns:
+        matched.update(i for i, value in enumerate(column) if any(k in value for k in keywords))
+    return sorted(matched)
+
+
+def build_search_haystacks(data: Sequence[Dict[str, Any]]) -> Tuple[str, ...]:
+    """
+    Case-folded JSON dump of each object, kept parallel to data for search_json_objects().
+    """
+    # ensure_ascii=False keeps non-ASCII text literal; \uXXXX escapes would never match a query
+    return tuple(json.dumps(obj, ensure_ascii=False).casefold() for obj in data)
+
+
+def search_json_positions(haystacks: Sequence[str], query: str) -> List[int]:
+    """
+    Return the positions of the haystacks containing any keyword from the cleaned query.
+
+    Args:
+        haystacks (list[str]): build_search_haystacks() output.
+        query (str): User query string.
+
+    Returns:
+        list[int]: Matching positions in ascending order.
     """
     # Clean query tokens
-    tokens = re.findall(r'\w+', query.lower())
-    keywords = [t for t  in tokens if t not in all_stopwords]
+    keywords = extract_keywords(query)
 
     if not keywords:
         # If no keywords, it means the query might have been entirely stopwords,
@@ -38,12 +204,27 @@ def search_json_objects(data, query):
         # The routing logic in run_multimodal_query should handle "list all" via LISTALL label.
         return [] # Return empty list if no meaningful keywords for specific filtering
 
-    matched = []
-    for obj in data:
-        dumped = json.dumps(obj).lower()
-        
-        # If any keyword is substring in dumped JSON, keep object
-        if any(k in dumped for k in keywords):
-            matched.append(obj)
+    # If any keyword is substring in dumped JSON, keep object
+    return [i for i, dumped in enumerate(haystacks) if any(k in dumped for k in keywords)]
+
+
+def search_json_objects(
+    data: Sequence[Dict[str, Any]],
+    query: str,
+    haystacks: Optional[Sequence[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Search JSON objects for any keyword from cleaned query.
+
+    Args:
+        data (list[dict]): List of JSON objects.
+        query (str): User query string.
+        haystacks (list[str], optional): Precomputed build_search_haystacks(data).
+
+    Returns:
+        list[dict]: List of matched JSON objects.
+    """
+    if haystacks is None:
+        haystacks = build_search_haystacks(data)
 
-    return matched
+    return [data[i] for i in search_json_positions(haystacks, query)]
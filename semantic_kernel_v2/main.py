@@ -1,5 +1,62 @@
 from core.agents.manager_agent import ManagerAgent
 import asyncio
+import sys
+import threading
+
+# Queries entered (or piped in) within DEBOUNCE_SECONDS of each other are answered in one call
+DEBOUNCE_SECONDS = 0.2
+MAX_BATCH = 8
+
+
+def show_prompt() -> None:
+    print("\nYou: ", end="", flush=True)
+
+
+def read_queries(loop: asyncio.AbstractEventLoop, queue: asyncio.Queue) -> None:
+    """
+    Read user input and queue it on the loop; None marks the end of input.
+    Runs in a daemon thread, so a read still pending at exit never blocks shutdown.
+    The prompt is printed by answer_queries(), once the previous answer is out.
+    """
+    while True:
+        line = sys.stdin.readline()
+        user_input = line.rstrip("\n") if line else 'exit'
+        if user_input.lower() == 'exit':
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+            return
+        loop.call_soon_threadsafe(queue.put_nowait, user_input)
+
+
+async def answer_queries(manager_agent_instance: ManagerAgent, queue: asyncio.Queue) -> None:
+    """
+    Answer queued queries, coalescing bursts into a single agent call.
+    """
+    done = False
+    while not done:
+        query = await queue.get()
+        if query is None:
+            return
+
+        batch = [query]
+        while len(batch) < MAX_BATCH:
+            try:
+                query = await asyncio.wait_for(queue.get(), DEBOUNCE_SECONDS)
+            except asyncio.TimeoutError:
+                break
+            if query is None:
+                done = True
+                break
+            batch.append(query)
+
+        if len(batch) == 1:
+            prompt = batch[0]
+        else:
+            prompt = "Handle these queries:\n" + "\n".join(f"{i}) {q}" for i, q in enumerate(batch, start=1))
+
+        response = await manager_agent_instance.run(prompt)
+        print(response)
+        if not done and queue.empty():
+            show_prompt()
 
 
 async def main():
@@ -10,16 +67,19 @@ async def main():
     """
     print("\n--- Welcome to the Project Assistant (Local) ---")
     print("Type your queries about sites and tasks. Type 'exit' to quit.")
-    
-    while True:
-        user_input = input("\nYou: ")
-        if user_input.lower() == 'exit':
-            print("Exiting Project Assistant. Goodbye!")
-            break
-        
-        response = await manager_agent_instance.run(user_input)
-        print(response)
 
-        
+    queue: asyncio.Queue = asyncio.Queue()
+    threading.Thread(
+        target=read_queries, args=(asyncio.get_running_loop(), queue), daemon=True
+    ).start()
+    show_prompt()
+    try:
+        await answer_queries(manager_agent_instance, queue)
+    except Exception as e:
+        print(f"\nError while answering: {e}")
+    finally:
+        print("Exiting Project Assistant. Goodbye!")
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.plugins.delagation_plugin import (DelegationPlugin,
+                                            build_batched_prompt,
+                                            split_batched_answers)
+
+
+class FakeAgent:
+    """Stands in for SitesTasksAgent; answers batched prompts with numbered headings."""
+
+    def __init__(self, well_formed=True):
+        self.well_formed = well_formed
+        self.prompts = []
+
+    async def run(self, user_query):
+        self.prompts.append(user_query)
+        if user_query.startswith("Answer each"):
+            count = user_query.count("\n", user_query.index("Queries:"))
+            if not self.well_formed:
+                return "I answered all of them together."
+            return "\n".join(f"### Answer {i}\nanswer {i}" for i in range(1, count + 1))
+        return f"single: {user_query}"
+
+
+class SplitBatchedAnswersTest(unittest.TestCase):
+
+    def test_splits_one_answer_per_query(self):
+        response = "Sure.\n### Answer 1\nfirst\n\n### Answer 2\nsecond\n"
+        self.assertEqual(split_batched_answers(response, 2), ["first", "second"])
+
+    def test_rejects_missing_or_out_of_order_headings(self):
+        self.assertIsNone(split_batched_answers("### Answer 1\nfirst", 2))
+        self.assertIsNone(split_batched_answers("### Answer 2\nb\n### Answer 1\na", 2))
+        self.assertIsNone(split_batched_answers("no headings at all", 1))
+
+    def test_handles_empty_response(self):
+        self.assertIsNone(split_batched_answers(None, 1))
+        self.assertIsNone(split_batched_answers("", 1))
+
+    def test_batched_prompt_numbers_queries(self):
+        prompt = build_batched_prompt(["a", "b"])
+        self.assertTrue(prompt.endswith("Queries:\n1) a\n2) b"))
+
+
+class BatchPathTest(unittest.IsolatedAsyncioTestCase):
+
+    async def delegate(self, agent, queries):
+        plugin = DelegationPlugin()
+        plugin._agent = agent
+        return await asyncio.gather(*(plugin.call_sites_tasks_agent(q) for q in queries))
+
+    async def test_concurrent_delegations_share_one_call(self):
+        agent = FakeAgent()
+        results = await self.delegate(agent, ["q1", "q2", "q3"])
+
+        self.assertEqual(len(agent.prompts), 1)
+        self.assertEqual(results, [f"Sites & Tasks Agent responded:\nanswer {i}" for i in (1, 2, 3)])
+
+    async def test_unsplittable_reply_falls_back_to_single_queries(self):
+        agent = FakeAgent(well_formed=False)
+        results = await self.delegate(agent, ["q1", "q2"])
+
+        self.assertEqual(agent.prompts[1:], ["q1", "q2"])
+        self.assertEqual(results, ["Sites & Tasks Agent responded:\nsingle: q1",
+                                   "Sites & Tasks Agent responded:\nsingle: q2"])
+
+
+if __name__ == "__main__":
+    unittest.main()